@@ -1,12 +1,17 @@
 """Module for creating agent metadata."""
-from file_scraper import __version__ as file_scraper_version
+import functools
+
 from mets_builder.metadata import DigitalProvenanceAgentMetadata
 
 from siptools_ng import __version__
 
 
+@functools.lru_cache(maxsize=None)
 def get_siptools_ng_agent() -> DigitalProvenanceAgentMetadata:
-    """Return agent metadata representing dpres-siptools-ng itself."""
+    """Return agent metadata representing dpres-siptools-ng itself.
+
+    The same agent instance is returned on every call.
+    """
     return DigitalProvenanceAgentMetadata(
         name="dpres-siptools-ng",
         agent_type="software",
@@ -14,8 +19,16 @@ def get_siptools_ng_agent() -> DigitalProvenanceAgentMetadata:
     )
 
 
+@functools.lru_cache(maxsize=None)
 def get_file_scraper_agent() -> DigitalProvenanceAgentMetadata:
-    """Return agent metadata representing file-scraper."""
+    """Return agent metadata representing file-scraper.
+
+    The same agent instance is returned on every call.
+    """
+    # Imported here so that importing this module does not import
+    # file-scraper
+    from file_scraper import __version__ as file_scraper_version
+
     return DigitalProvenanceAgentMetadata(
         name="file-scraper",
         agent_type="software",
@@ -1,11 +1,19 @@
 """Module for handling digital objects in SIP."""
+import concurrent.futures
+import errno
+import functools
+import hashlib
+import operator
+import os
 import platform
-from datetime import datetime
+import stat
+import time
 from pathlib import Path, PurePath
 from typing import Iterable, Optional, Union
 
+import file_scraper
+import file_scraper.defaults
 import mets_builder
-import file_scraper.scraper
 from mets_builder.defaults import UNAV
 from mets_builder.metadata import (DigitalProvenanceEventMetadata,
                                    DigitalProvenanceAgentMetadata)
@@ -33,34 +41,52 @@ def _normalize_unav(value):
     return value
 
 
-def _file_creation_date(filepath: Path) -> str:
+# Stat result attribute that holds the creation time of a file on this
+# platform. See http://stackoverflow.com/a/39501288/1709587 for
+# explanation.
+if platform.system() == "Windows":
+    _CREATION_TIME_ATTRIBUTE = "st_ctime"
+elif hasattr(os.stat_result, "st_birthtime"):
+    # Some Unix systems such as macOS might have birthtime defined
+    _CREATION_TIME_ATTRIBUTE = "st_birthtime"
+else:
+    # We're probably on Linux. No easy way to get creation dates here, so
+    # we'll settle for when its content was last modified.
+    _CREATION_TIME_ATTRIBUTE = "st_mtime"
+
+_get_creation_time = operator.attrgetter(_CREATION_TIME_ATTRIBUTE)
+
+# Errors from stat that are treated as the source path not being a file
+_IGNORED_STAT_ERRNOS = (
+    errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP
+)
+
+
+def _file_creation_date(stat_result: os.stat_result) -> str:
     """Return creation date for file.
 
     Try to get the date that a file was created, falling back to when it
-    was last modified if that isn't possible. See
-    http://stackoverflow.com/a/39501288/1709587 for explanation.
+    was last modified if that isn't possible.
 
-    :param filepath: Path to the file.
+    :param stat_result: Stat result of the file.
 
     :returns: Timestamp for the creation date of the file, or for the last
         modification date if the creation date is not found.
     """
-    stat = filepath.stat()
+    return time.strftime(
+        "%Y-%m-%dT%H:%M:%S",
+        time.localtime(_get_creation_time(stat_result))
+    )
 
-    if platform.system() == "Windows":
-        creation_date = datetime.fromtimestamp(stat.st_ctime)
-    else:
-        try:
-            # Some Unix systems such as macOS might have birthtime defined
-            creation_date = datetime.fromtimestamp(
-                stat.st_birthtime  # type:ignore
-            )
-        except AttributeError:
-            # We're probably on Linux. No easy way to get creation dates
-            # here, so we'll settle for when its content was last modified.
-            creation_date = datetime.fromtimestamp(stat.st_mtime)
 
-    return creation_date.isoformat(timespec="seconds")
+@functools.lru_cache(maxsize=1024)
+def _default_csv_header(column_count: int) -> tuple:
+    """Return generated header for a CSV file without a header row.
+
+    CSV files in a SIP tend to share the same number of columns, so the
+    generated headers are cached.
+    """
+    return tuple(f"header{n}" for n in range(1, column_count + 1))
 
 
 def _create_technical_csv_metadata(
@@ -71,7 +97,7 @@ def _create_technical_csv_metadata(
     if has_header:
         header = first_line
     else:
-        header = [f"header{n}" for n in range(1, len(first_line) + 1)]
+        header = list(_default_csv_header(len(first_line)))
 
     return mets_builder.metadata.TechnicalCSVMetadata(
         filenames=[filepath],
@@ -101,56 +127,237 @@ def _create_technical_image_metadata(
     )
 
 
+# Default values for optional file-scraper audio stream fields
+_AUDIO_STREAM_DEFAULTS = {
+    "audio_data_encoding": UNAV,
+    "bits_per_sample": "0",
+    "codec_creator_app": UNAV,
+    "codec_creator_app_version": UNAV,
+    "codec_name": UNAV,
+    "data_rate": "0",
+    "sampling_frequency": "0",
+    "duration": UNAV,
+    "num_channels": UNAV
+}
+
+
 def _create_technical_audio_metadata(
     stream: dict
 ) -> mets_builder.metadata.TechnicalAudioMetadata:
     """Create technical audio metadata from file-scraper stream."""
+    stream = {**_AUDIO_STREAM_DEFAULTS, **stream}
     return mets_builder.metadata.TechnicalAudioMetadata(
         codec_quality=stream["codec_quality"],
         data_rate_mode=stream["data_rate_mode"],
-        audio_data_encoding=stream.get("audio_data_encoding", UNAV),
-        bits_per_sample=_normalize_unav(stream.get("bits_per_sample", "0")),
-        codec_creator_app=stream.get("codec_creator_app", UNAV),
-        codec_creator_app_version=stream.get(
-            "codec_creator_app_version", UNAV
-        ),
-        codec_name=stream.get("codec_name", UNAV),
-        data_rate=_normalize_unav(stream.get("data_rate", "0")),
-        sampling_frequency=_normalize_unav(
-            stream.get("sampling_frequency", "0")
-        ),
-        duration=stream.get("duration", UNAV),
-        num_channels=stream.get("num_channels", UNAV)
+        audio_data_encoding=stream["audio_data_encoding"],
+        bits_per_sample=_normalize_unav(stream["bits_per_sample"]),
+        codec_creator_app=stream["codec_creator_app"],
+        codec_creator_app_version=stream["codec_creator_app_version"],
+        codec_name=stream["codec_name"],
+        data_rate=_normalize_unav(stream["data_rate"]),
+        sampling_frequency=_normalize_unav(stream["sampling_frequency"]),
+        duration=stream["duration"],
+        num_channels=stream["num_channels"]
     )
 
 
+# Default values for optional file-scraper video stream fields
+_VIDEO_STREAM_DEFAULTS = {
+    "duration": UNAV,
+    "data_rate": "0",
+    "bits_per_sample": "0",
+    "codec_creator_app": UNAV,
+    "codec_creator_app_version": UNAV,
+    "codec_name": UNAV,
+    "frame_rate": "0",
+    "width": "0",
+    "height": "0",
+    "par": "0",
+    "dar": UNAV,
+    "sampling": UNAV,
+    "signal_format": UNAV
+}
+
+
 def _create_technical_video_metadata(
     stream: dict
 ) -> mets_builder.metadata.TechnicalVideoMetadata:
     """Create technical video metadata from file-scraper stream."""
+    stream = {**_VIDEO_STREAM_DEFAULTS, **stream}
     return mets_builder.metadata.TechnicalVideoMetadata(
-        duration=stream.get("duration", UNAV),
-        data_rate=_normalize_unav(stream.get("data_rate", "0")),
-        bits_per_sample=_normalize_unav(stream.get("bits_per_sample", "0")),
+        duration=stream["duration"],
+        data_rate=_normalize_unav(stream["data_rate"]),
+        bits_per_sample=_normalize_unav(stream["bits_per_sample"]),
         color=stream["color"],
-        codec_creator_app=stream.get("codec_creator_app", UNAV),
-        codec_creator_app_version=stream.get(
-            "codec_creator_app_version", UNAV
-        ),
-        codec_name=stream.get("codec_name", UNAV),
+        codec_creator_app=stream["codec_creator_app"],
+        codec_creator_app_version=stream["codec_creator_app_version"],
+        codec_name=stream["codec_name"],
         codec_quality=stream["codec_quality"],
         data_rate_mode=stream["data_rate_mode"],
-        frame_rate=_normalize_unav(stream.get("frame_rate", "0")),
-        pixels_horizontal=_normalize_unav(stream.get("width", "0")),
-        pixels_vertical=_normalize_unav(stream.get("height", "0")),
-        par=_normalize_unav(stream.get("par", "0")),
-        dar=stream.get("dar", UNAV),
-        sampling=stream.get("sampling", UNAV),
-        signal_format=stream.get("signal_format", UNAV),
+        frame_rate=_normalize_unav(stream["frame_rate"]),
+        pixels_horizontal=_normalize_unav(stream["width"]),
+        pixels_vertical=_normalize_unav(stream["height"]),
+        par=_normalize_unav(stream["par"]),
+        dar=stream["dar"],
+        sampling=stream["sampling"],
+        signal_format=stream["signal_format"],
         sound=stream["sound"]
     )
 
 
+# Map file-scraper stream types to the functions creating their technical
+# characteristics
+_TECHNICAL_METADATA_CREATORS = {
+    "image": _create_technical_image_metadata,
+    "audio": _create_technical_audio_metadata,
+    "video": _create_technical_video_metadata
+}
+
+
+# Chunk size used when reading files for checksum calculation
+CHECKSUM_CHUNK_SIZE = 1024 * 1024
+
+# Maximum number of files sent to a scraper worker process at once
+MAX_SCRAPE_CHUNKSIZE = 16
+
+# Map checksum algorithms that siptools-ng can calculate to hashlib names
+_HASHLIB_ALGORITHMS = {
+    "MD5": "md5",
+    "SHA-1": "sha1",
+    "SHA-224": "sha224",
+    "SHA-256": "sha256",
+    "SHA-384": "sha384",
+    "SHA-512": "sha512"
+}
+
+
+def _new_hash(algorithm: str):
+    """Return a new hash object for checksum calculation.
+
+    The checksums identify file contents and are not used for security, so
+    the hash is created with ``usedforsecurity=False`` when supported. This
+    keeps MD5 usable on systems running OpenSSL in FIPS mode.
+
+    :param algorithm: Name of the hash algorithm as accepted by
+        :func:`hashlib.new`.
+    """
+    try:
+        return hashlib.new(algorithm, usedforsecurity=False)
+    except TypeError:
+        # Python < 3.9 does not accept usedforsecurity
+        return hashlib.new(algorithm)
+
+
+def _fadvise(fd: int, advice: str, length: int = 0) -> None:
+    """Advise the operating system about the access pattern of a file.
+
+    Does nothing on platforms without :func:`os.posix_fadvise`. Errors are
+    ignored, as the advice is only a hint.
+
+    :param fd: File descriptor of the file.
+    :param advice: Name of the advice constant in :mod:`os`, for example
+        ``"POSIX_FADV_SEQUENTIAL"``.
+    :param length: Number of bytes from the beginning of the file the
+        advice applies to. If 0, the advice applies to the whole file.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    try:
+        os.posix_fadvise(fd, 0, length, getattr(os, advice))
+    except OSError:
+        pass
+
+
+def _file_checksum(
+    filepath: Union[str, Path],
+    algorithm: str = "md5"
+) -> str:
+    """Calculate checksum for a file.
+
+    :param filepath: Path to the file.
+    :param algorithm: Name of the hash algorithm as accepted by
+        :func:`hashlib.new`.
+
+    :returns: Hexadecimal checksum of the file contents.
+    """
+    with open(filepath, "rb") as file_:
+        # The file is read once from start to end, so let the kernel read
+        # ahead more aggressively
+        _fadvise(file_.fileno(), "POSIX_FADV_SEQUENTIAL")
+
+        if hasattr(hashlib, "file_digest"):
+            # Python 3.11+ hashes the file without a Python level loop
+            return hashlib.file_digest(
+                file_, lambda: _new_hash(algorithm)
+            ).hexdigest()
+
+        digest = _new_hash(algorithm)
+        for chunk in iter(lambda: file_.read(CHECKSUM_CHUNK_SIZE), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+def _scrape_file(
+    filepath: Union[str, Path],
+    file_format: Optional[str] = None,
+    file_format_version: Optional[str] = None,
+    charset: Union[mets_builder.metadata.Charset, str, None] = None,
+    csv_delimiter: Optional[str] = None,
+    csv_record_separator: Optional[str] = None,
+    csv_quoting_character: Optional[str] = None,
+    checksum_algorithm: str = "MD5",
+) -> dict:
+    """Scrape a file with file-scraper.
+
+    This is a module-level function so that it can be dispatched to worker
+    processes, see :meth:`File.generate_technical_metadata_batch`.
+
+    :param filepath: Path to the file to scrape.
+    :param file_format: Predefined mimetype of the file.
+    :param file_format_version: Predefined file format version of the file.
+    :param charset: Predefined character encoding of the file.
+    :param csv_delimiter: Predefined CSV delimiter character(s).
+    :param csv_record_separator: Predefined CSV record separator.
+    :param csv_quoting_character: Predefined CSV quoting character.
+    :param checksum_algorithm: Algorithm used to calculate the checksum,
+        one of the keys of ``_HASHLIB_ALGORITHMS``.
+
+    :returns: Dictionary containing scraper result data, that can be passed
+        to :meth:`File.generate_technical_metadata` or
+        :meth:`File.with_scraper_result`.
+    """
+    # The scraper module pulls in all scrapers and detectors with their
+    # dependencies, so it is imported only when a file is actually scraped
+    import file_scraper.scraper
+
+    # The checksum is calculated first, so that the file contents are in
+    # the page cache when the scrapers read the file
+    checksum = _file_checksum(filepath,
+                              _HASHLIB_ALGORITHMS[checksum_algorithm])
+
+    scraper = file_scraper.scraper.Scraper(
+        filename=str(filepath),
+        mimetype=file_format,
+        version=file_format_version,
+        charset=charset,
+        delimiter=csv_delimiter,
+        separator=csv_record_separator,
+        quotechar=csv_quoting_character,
+    )
+    scraper.scrape(check_wellformed=False)
+
+    return {
+        "streams": scraper.streams,
+        "info": scraper.info,
+        "mimetype": scraper.mimetype,
+        "version": scraper.version,
+        "checksum": checksum,
+        "checksum_algorithm": checksum_algorithm,
+        "grade": scraper.grade()
+    }
+
+
 class MetadataGenerationError(Exception):
     """Error raised when there is an error in metadata generation."""
 
@@ -163,6 +370,18 @@ class File:
     can be used to enrich the underlying METS entry with additional metadata.
     """
 
+    # SIPs can contain a very large number of files, so avoid the memory
+    # overhead of a per-instance __dict__
+    __slots__ = (
+        "_path",
+        "_stat",
+        "digital_object",
+        "_technical_metadata_generated",
+        "_csv_has_header",
+        "descriptive_metadata",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         path: Union[str, Path],
@@ -209,11 +428,13 @@ class File:
         """
         # Descriptive metadata will be added default structural map when
         # it is created. Other metadata is added to digital object.
-        self.descriptive_metadata \
-            |= {md for md in metadata if md.is_descriptive}
-        self.digital_object.add_metadata(
-            metadata=set(metadata) - self.descriptive_metadata
-        )
+        other_metadata = set()
+        for md in metadata:
+            if md.is_descriptive:
+                self.descriptive_metadata.add(md)
+            else:
+                other_metadata.add(md)
+        self.digital_object.add_metadata(metadata=other_metadata)
 
     @property
     def metadata(self) -> Iterable[mets_builder.metadata.Metadata]:
@@ -231,18 +452,27 @@ class File:
     @path.setter
     def path(self, path):
         """Setter for path."""
-        path = Path(path)
-
         # Resolve symbolic links in path
-        path = path.resolve()
+        path = os.path.realpath(path)
 
-        if not path.is_file():
+        # The stat result is stored, so that the file does not have to be
+        # stat'ed again when metadata is generated
+        try:
+            stat_result = os.stat(path)
+        except OSError as error:
+            # Ignore the same errors as pathlib.Path.is_file
+            if error.errno not in _IGNORED_STAT_ERRNOS:
+                raise
+            stat_result = None
+
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
             raise ValueError(
                 f"Source filepath '{path}' for the digital object "
                 "is not a file."
             )
 
-        self._path = path
+        self._path = Path(path)
+        self._stat = stat_result
 
     def _create_technical_characteristics(self, stream: dict) -> \
             Optional[mets_builder.metadata.TechnicalObjectMetadata]:
@@ -259,13 +489,11 @@ class File:
             return _create_technical_csv_metadata(stream,
                                                   self.digital_object.path,
                                                   self._csv_has_header)
-        stream_type = stream["stream_type"]
-        if stream_type == "image":
-            return _create_technical_image_metadata(stream)
-        if stream_type == "audio":
-            return _create_technical_audio_metadata(stream)
-        if stream_type == "video":
-            return _create_technical_video_metadata(stream)
+        create_metadata = _TECHNICAL_METADATA_CREATORS.get(
+            stream["stream_type"]
+        )
+        if create_metadata:
+            return create_metadata(stream)
 
         return None
 
@@ -423,60 +651,52 @@ class File:
             self._csv_has_header = csv_has_header
 
         if not scraper_result:
-            scraper = file_scraper.scraper.Scraper(
-                filename=str(self.path),
-                mimetype=file_format,
-                version=file_format_version,
+            scraper_result = _scrape_file(
+                self.path,
+                file_format=file_format,
+                file_format_version=file_format_version,
                 charset=charset,
-                delimiter=csv_delimiter,
-                separator=csv_record_separator,
-                quotechar=csv_quoting_character,
+                csv_delimiter=csv_delimiter,
+                csv_record_separator=csv_record_separator,
+                csv_quoting_character=csv_quoting_character,
             )
-            scraper.scrape(check_wellformed=False)
-
-            scraper_result = {
-                "streams": scraper.streams,
-                "info": scraper.info,
-                "mimetype": scraper.mimetype,
-                "version": scraper.version,
-                "checksum": scraper.checksum(algorithm="MD5"),
-                "grade": scraper.grade()
-            }
+
+        # The first stream is the container itself, the rest are the
+        # streams it contains
+        scraped_streams = iter(scraper_result["streams"].values())
+        container = next(scraped_streams)
 
         # Create PREMIS metadata for file
         file_metadata = mets_builder.metadata.TechnicalFileObjectMetadata(
             file_format=scraper_result["mimetype"],
             file_format_version=scraper_result["version"],
-            checksum_algorithm=checksum_algorithm or "MD5",
+            checksum_algorithm=checksum_algorithm
+            or scraper_result.get("checksum_algorithm", "MD5"),
             checksum=checksum or scraper_result["checksum"],
             file_created_date=file_created_date
-            or _file_creation_date(self.path),
+            or _file_creation_date(self._stat),
             object_identifier_type=object_identifier_type,
             object_identifier=object_identifier,
-            charset=charset or
-            scraper_result["streams"][0].get("charset", None),
+            charset=charset or container.get("charset", None),
             original_name=original_name or self.path.name,
             format_registry_name=format_registry_name,
             format_registry_key=format_registry_key,
             creating_application=creating_application,
             creating_application_version=creating_application_version
         )
-        self.digital_object.add_metadata([file_metadata])
+        # Metadata and streams are collected first and added to the
+        # digital object in one go at the end
+        metadata = [file_metadata]
+        streams = []
 
         # Create file format specific metadata (eg. AudioMD, MixMD,
         # VideoMD)
-        characteristics = self._create_technical_characteristics(
-            scraper_result["streams"][0]
-        )
+        characteristics = self._create_technical_characteristics(container)
         if characteristics:
-            self.digital_object.add_metadata([characteristics])
+            metadata.append(characteristics)
 
         # Create metadata for the streams of a given file
-        for i, stream in enumerate(scraper_result["streams"].values()):
-            if i == 0:
-                # Skip the container itself
-                continue
-
+        for stream in scraped_streams:
             stream_metadata = \
                 mets_builder.metadata.TechnicalBitstreamObjectMetadata(
                     file_format=stream["mimetype"],
@@ -499,14 +719,36 @@ class File:
             if characteristics:
                 digital_object_stream.add_metadata([characteristics])
 
-            self.digital_object.add_streams([digital_object_stream])
+            streams.append(digital_object_stream)
 
-        # Document file scraping
+        # Document file scraping. The Scrapers and Detectors used by
+        # file-scraper are sorted out in a single pass.
+        scraper_infos = []
+        detector_infos = []
+        for scraper_info in scraper_result["info"].values():
+            if scraper_info["class"].endswith("Scraper"):
+                scraper_infos.append(scraper_info)
+            elif scraper_info["class"].endswith("Detector"):
+                detector_infos.append(scraper_info)
+
+        file_scraper_agent = siptools_ng.agent.get_file_scraper_agent()
         if not checksum:
-            self._add_checksum_calculation_event()
+            metadata.append(_get_checksum_calculation_event())
         if not file_format:
-            self._add_format_identification_event(scraper_result)
-        self._add_metadata_extraction_event(scraper_result)
+            metadata.append(
+                self._create_format_identification_event(
+                    detector_infos, file_scraper_agent
+                )
+            )
+        metadata.append(
+            self._create_metadata_extraction_event(
+                scraper_infos, file_scraper_agent
+            )
+        )
+
+        self.digital_object.add_metadata(metadata)
+        if streams:
+            self.digital_object.add_streams(streams)
 
         # If file-scraper detects the file as "bit-level file" (for
         # example SEG-Y), set the use attribute accordingly.
@@ -516,27 +758,9 @@ class File:
 
         return scraper_result
 
-    def _add_checksum_calculation_event(self):
-        """Add checksum calculation event to a digital object."""
-        checksum_event = DigitalProvenanceEventMetadata(
-            event_type="message digest calculation",
-            detail="Checksum calculation for digital objects",
-            outcome="success",
-            outcome_detail=(
-                "Checksum successfully calculated for digital objects."
-            )
-        )
-        file_scraper_agent = siptools_ng.agent.get_file_scraper_agent()
-
-        checksum_event.link_agent_metadata(
-            agent_metadata=file_scraper_agent,
-            agent_role="executing program"
-        )
-
-        self.digital_object.add_metadata([checksum_event, file_scraper_agent])
-
-    def _add_metadata_extraction_event(self, scraper_result):
-        """Add metadata extraction event to a digital object."""
+    def _create_metadata_extraction_event(self, scraper_infos,
+                                          file_scraper_agent):
+        """Create metadata extraction event for a digital object."""
         event = DigitalProvenanceEventMetadata(
             event_type="metadata extraction",
             detail=(
@@ -552,21 +776,18 @@ class File:
 
         # In addition file-scraper itself, create agent metadata representing
         # each Scraper that was used
-        scraper_infos = [
-            scraper_info for scraper_info in scraper_result["info"].values()
-            if scraper_info['class'].endswith("Scraper")
-        ]
-        agents = [siptools_ng.agent.get_file_scraper_agent()] \
+        agents = [file_scraper_agent] \
             + _create_scraper_agents(scraper_infos)
         for agent in agents:
             event.link_agent_metadata(
                 agent_metadata=agent,
                 agent_role="executing program"
             )
-        self.digital_object.add_metadata([event])
+        return event
 
-    def _add_format_identification_event(self, scraper_result):
-        """Add format identification event to a digital object."""
+    def _create_format_identification_event(self, detector_infos,
+                                            file_scraper_agent):
+        """Create format identification event for a digital object."""
         event = DigitalProvenanceEventMetadata(
             event_type="format identification",
             detail="MIME type and version identification",
@@ -578,11 +799,7 @@ class File:
 
         # In addition file-scraper itself, create agent metadata representing
         # each Detector that was used
-        detector_infos = [
-            scraper_info for scraper_info in scraper_result["info"].values()
-            if scraper_info['class'].endswith("Detector")
-        ]
-        agents = [siptools_ng.agent.get_file_scraper_agent()] \
+        agents = [file_scraper_agent] \
             + _create_scraper_agents(detector_infos)
 
         for agent in agents:
@@ -591,7 +808,7 @@ class File:
                 agent_role="executing program"
             )
 
-        self.digital_object.add_metadata([event])
+        return event
 
     # TODO: siptools-ng currently does not validate digital objects, so
     # this method is unused.
@@ -621,6 +838,99 @@ class File:
 
         self.add_metadata([event])
 
+    @staticmethod
+    def generate_technical_metadata_batch(
+        files: Iterable["File"],
+        max_workers: Optional[int] = None,
+        checksum_algorithm: Union[
+            mets_builder.metadata.ChecksumAlgorithm, str
+        ] = "MD5"
+    ) -> None:
+        """Generate technical metadata for multiple files in parallel.
+
+        The files are scraped in worker processes, and the scraper results
+        are turned into metadata in this process, as the metadata objects
+        of the files are not shared with the workers. Files that share the
+        same source file are scraped only once. The technical metadata is
+        generated with default parameters, see
+        :meth:`File.generate_technical_metadata`.
+
+        :param files: Files to generate technical metadata for.
+        :param max_workers: Maximum number of worker processes. If None,
+            the number of processors on the machine is used. If 1, or if
+            there is only one source file, the files are scraped in this
+            process. Using worker processes requires that the main module
+            of the calling script is guarded with
+            ``if __name__ == "__main__":``.
+        :param checksum_algorithm: Algorithm used to calculate the
+            checksums of the files. Supported algorithms are MD5, SHA-1,
+            SHA-224, SHA-256, SHA-384 and SHA-512. SHA-256 can be faster
+            than MD5 on processors with SHA extensions.
+
+        :raises MetadataGenerationError: If technical metadata has already
+            been generated for any of the files.
+        :raises ValueError: If the checksum algorithm is not supported or
+            max_workers is less than 1.
+        """
+        checksum_algorithm = getattr(checksum_algorithm, "value",
+                                     checksum_algorithm)
+        if checksum_algorithm not in _HASHLIB_ALGORITHMS:
+            raise ValueError(
+                f"Unsupported checksum algorithm '{checksum_algorithm}'."
+            )
+        if max_workers is not None and max_workers < 1:
+            raise ValueError(
+                f"Invalid number of worker processes '{max_workers}'."
+            )
+
+        files = list(files)
+        if not files:
+            return
+
+        if any(file._technical_metadata_generated for file in files):
+            raise MetadataGenerationError(
+                "Technical metadata has already been generated for the "
+                "digital object."
+            )
+
+        # Paths of the source files in the order they are first encountered
+        source_paths = list(dict.fromkeys(file.path for file in files))
+
+        scrape_file = functools.partial(
+            _scrape_file, checksum_algorithm=checksum_algorithm
+        )
+        # Workers beyond the number of files would only sit idle
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        workers = min(max_workers, len(source_paths))
+        if workers == 1:
+            # Starting a worker process is not worth it when the files
+            # would be scraped one at a time anyway
+            scraper_results = {
+                source_path: scrape_file(source_path)
+                for source_path in source_paths
+            }
+        else:
+            # Send the files to the workers in chunks to cut down the
+            # interprocess communication when there are many small files,
+            # but keep several chunks per worker to balance the load
+            chunksize = min(
+                MAX_SCRAPE_CHUNKSIZE,
+                max(1, len(source_paths) // (workers * 4))
+            )
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=workers) as executor:
+                scraper_results = dict(
+                    zip(source_paths,
+                        executor.map(scrape_file, source_paths,
+                                     chunksize=chunksize))
+                )
+
+        for file in files:
+            file.generate_technical_metadata(
+                scraper_result=scraper_results[file.path]
+            )
+
     @classmethod
     def with_scraper_result(
         cls,
@@ -651,27 +961,62 @@ class File:
         return file
 
 
-def _create_scraper_agents(scraper_infos):
-    agents = []
-    for scraper_info in scraper_infos:
-        if scraper_info["tools"]:
-            tools = 'Used tools (name-version): ' \
-                + ', '.join(scraper_info['tools'])
-        else:
-            # The scraper/detector does not use any external tools
-            # TODO: It probably would not make much sense to create
-            # separate agent for this scraper/detector, as agent
-            # representing file-scraper will be created anyway. However,
-            # tools have not yet been defined for ANY scraper/detector,
-            # so it is probably better to create agent for every
-            # scraper/detector until the tools have been defined!
-            tools = None
-        agents.append(
-            DigitalProvenanceAgentMetadata(
-                name=scraper_info['class'],
-                agent_type="software",
-                version=file_scraper.__version__,
-                note=tools
-            )
+@functools.lru_cache(maxsize=None)
+def _get_checksum_calculation_event() -> DigitalProvenanceEventMetadata:
+    """Return checksum calculation event for digital objects.
+
+    The event is identical for all files, so the same event instance is
+    shared by all digital objects.
+    """
+    checksum_event = DigitalProvenanceEventMetadata(
+        event_type="message digest calculation",
+        detail="Checksum calculation for digital objects",
+        outcome="success",
+        outcome_detail=(
+            "Checksum successfully calculated for digital objects."
         )
-    return agents
+    )
+    file_scraper_agent = siptools_ng.agent.get_file_scraper_agent()
+
+    checksum_event.link_agent_metadata(
+        agent_metadata=file_scraper_agent,
+        agent_role="executing program"
+    )
+
+    return checksum_event
+
+
+def _create_scraper_agents(scraper_infos):
+    return [
+        _get_scraper_agent(scraper_info["class"],
+                           tuple(scraper_info["tools"]))
+        for scraper_info in scraper_infos
+    ]
+
+
+@functools.lru_cache(maxsize=None)
+def _get_scraper_agent(
+    class_name: str, tools: tuple
+) -> DigitalProvenanceAgentMetadata:
+    """Return agent representing a file-scraper Scraper or Detector.
+
+    The same scrapers and detectors are used for many files, so the agent
+    instance is shared by all events with the same class and tools.
+    """
+    if tools:
+        note = 'Used tools (name-version): ' + ', '.join(tools)
+    else:
+        # The scraper/detector does not use any external tools
+        # TODO: It probably would not make much sense to create
+        # separate agent for this scraper/detector, as agent
+        # representing file-scraper will be created anyway. However,
+        # tools have not yet been defined for ANY scraper/detector,
+        # so it is probably better to create agent for every
+        # scraper/detector until the tools have been defined!
+        note = None
+    return DigitalProvenanceAgentMetadata(
+        name=class_name,
+        agent_type="software",
+        version=file_scraper.__version__,
+        note=note
+    )
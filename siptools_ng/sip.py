@@ -1,10 +1,11 @@
 """Module for Submission Information Package (SIP) handling."""
+import concurrent.futures
+import os
 import tarfile
 import tempfile
-from collections import defaultdict
 from collections.abc import Iterable
 from pathlib import Path, PurePath
-from typing import Optional, Union
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 
 import dpres_signature.signature
 import mets_builder
@@ -14,11 +15,19 @@ from mets_builder.metadata import (DigitalProvenanceAgentMetadata,
 from mets_builder.structural_map import StructuralMap, StructuralMapDiv
 
 import siptools_ng.agent
-from siptools_ng.file import File
+from siptools_ng.file import File, _fadvise
 
 METS_FILENAME = "mets.xml"
 SIGNATURE_FILENAME = "signature.sig"
 
+# Buffer size used when writing the tar file
+TAR_BUFFER_SIZE = 2 * 1024 * 1024
+
+# Number of upcoming files, and the number of bytes from the beginning of
+# each file, that are prefetched while the SIP is written
+PREFETCH_FILE_COUNT = 4
+PREFETCH_SIZE = 16 * 1024 * 1024
+
 
 class SIP:
     """Class for Submission Information Package (SIP) handling.
@@ -46,6 +55,8 @@ class SIP:
         if files:
             self.files = files
 
+        self._default_structural_map = None
+
     def finalize(
         self,
         output_filepath: Union[str, Path],
@@ -141,21 +152,49 @@ class SIP:
             advance) that is included in this SIP.
         """
         tmp_digital_object_path = Path(f"{output_filepath}.tmp")
-        with tarfile.open(tmp_digital_object_path, "w") as tarred_sip:
-            tarred_sip.add(name=mets_filepath, arcname=METS_FILENAME)
-            tarred_sip.add(name=signature_filepath, arcname=SIGNATURE_FILENAME)
-            for file in self.files:
+        try:
+            # Tar headers and padding are written in 512 byte blocks, so
+            # buffer the output to avoid a write call for every block
+            with open(tmp_digital_object_path, "wb",
+                      buffering=TAR_BUFFER_SIZE) as tar_file, \
+                    tarfile.open(fileobj=tar_file, mode="w") as tarred_sip:
+                # Copy file contents in larger chunks than the tarfile
+                # default. The attribute is only read on Python 3.8+, and
+                # setting it is harmless on older versions.
+                tarred_sip.copybufsize = (  # type: ignore[attr-defined]
+                    TAR_BUFFER_SIZE
+                )
+                tarred_sip.add(name=mets_filepath, arcname=METS_FILENAME)
                 tarred_sip.add(
-                    name=file.path,
-                    arcname=file.digital_object.path
+                    name=signature_filepath, arcname=SIGNATURE_FILENAME
+                )
+                # Write the largest files first, so that the small files at
+                # the end are packed into the output buffer together. The
+                # order of the files in the tar does not affect the METS
+                # document.
+                files = sorted(
+                    self.files,
+                    key=lambda file: file._stat.st_size,
+                    reverse=True
                 )
+                for file in _prefetch_files(files):
+                    _add_to_tar(
+                        tarred_sip,
+                        path=file.path,
+                        arcname=file.digital_object.path
+                    )
+        except BaseException:
+            # Do not leave an incomplete SIP behind
+            if tmp_digital_object_path.exists():
+                tmp_digital_object_path.unlink()
+            raise
 
         tmp_digital_object_path.rename(output_filepath)
 
     @property
     def default_structural_map(self):
         """Default structural map."""
-        if self._default_structural_map \
+        if self._default_structural_map is not None \
                 and self._default_structural_map \
                 not in self.mets.structural_maps:
             raise ValueError("Default structural map no longer set")
@@ -167,6 +206,10 @@ class SIP:
         cls,
         files: Iterable[File],
         mets: mets_builder.METS,
+        max_workers: Optional[int] = 1,
+        checksum_algorithm: Union[
+            mets_builder.metadata.ChecksumAlgorithm, str
+        ] = "MD5",
     ) -> "SIP":
         """Generate a complete SIP object from a list of File instances.
 
@@ -174,17 +217,32 @@ class SIP:
         structural map is generated according to the directory structure
         defined in the files.
 
+        The files without technical metadata can be scraped in parallel
+        worker processes, see :meth:`File.generate_technical_metadata_batch`.
+
         :param mets: Initialized METS object. The METS object will be populated
                      with additional entries (structural map, agents, events).
         :param files: File instances. Technical metadata is automatically
                       generated for those that don't already have it.
+        :param max_workers: Maximum number of worker processes used to scrape
+            the files. By default the files are scraped in this process. If
+            None, the number of processors on the machine is used. Using
+            worker processes requires that the main module of the calling
+            script is guarded with ``if __name__ == "__main__":``.
+        :param checksum_algorithm: Algorithm used to calculate the
+            checksums of the files that don't have technical metadata yet,
+            see :meth:`File.generate_technical_metadata_batch`.
 
         :returns: SIP object initialized according to the given files
         """
-
-        for file in files:
-            if not file._technical_metadata_generated:
-                file.generate_technical_metadata()
+        # The same File instance may be given more than once, but its
+        # technical metadata can only be generated once
+        File.generate_technical_metadata_batch(
+            [file for file in dict.fromkeys(files)
+             if not file._technical_metadata_generated],
+            max_workers=max_workers,
+            checksum_algorithm=checksum_algorithm
+        )
 
         sip = cls(mets=mets, files=files)
 
@@ -205,6 +263,10 @@ class SIP:
         cls,
         directory_path: Union[Path, str],
         mets: mets_builder.METS,
+        max_workers: Optional[int] = 1,
+        checksum_algorithm: Union[
+            mets_builder.metadata.ChecksumAlgorithm, str
+        ] = "MD5",
     ) -> "SIP":
         """Generate a SIP object according to the contents of a directory.
 
@@ -213,10 +275,21 @@ class SIP:
         to the directory structure found in the given directory_path, and
         simple file references are generated.
 
+        The files can be scraped in parallel worker processes, see
+        :meth:`File.generate_technical_metadata_batch`.
+
         :param directory_path: Path to a local directory.
         :param mets: Initialized METS object. This METS object will be edited
             in place by this method to represent the files and the directory
             structure in the given directory_path.
+        :param max_workers: Maximum number of worker processes used to scrape
+            the files. By default the files are scraped in this process. If
+            None, the number of processors on the machine is used. Using
+            worker processes requires that the main module of the calling
+            script is guarded with ``if __name__ == "__main__":``.
+        :param checksum_algorithm: Algorithm used to calculate the
+            checksums of the files, see
+            :meth:`File.generate_technical_metadata_batch`.
 
         :raises: ValueError if the given directory_path does not exist or is
             not a directory.
@@ -232,20 +305,25 @@ class SIP:
                 f"Path '{str(directory_path)}' is not a directory."
             )
 
-        file_paths = {
-            path for path in directory_path.rglob("*") if path.is_file()}
-
-        files = {
+        files = [
             File(
-                path=file_,
-                digital_object_path=file_.relative_to(directory_path.parent)
+                path=entry.path,
+                digital_object_path=Path(entry.path).relative_to(
+                    directory_path.parent
+                )
             )
-            for file_ in file_paths
-        }
-
-        # Pass the generated File instances to `SIP.from_files`, which
-        # will handle rest of the automatic SIP creation.
-        return cls.from_files(mets=mets, files=files)
+            for entry in _scan_files(directory_path)
+        ]
+
+        # Pass the File instances to `SIP.from_files`, which will generate
+        # the technical metadata and handle rest of the automatic SIP
+        # creation.
+        return cls.from_files(
+            mets=mets,
+            files=files,
+            max_workers=max_workers,
+            checksum_algorithm=checksum_algorithm
+        )
 
     def add_metadata(self, metadata: Iterable[Metadata]):
         """Add an iterable of metadata to SIP.
@@ -259,16 +337,113 @@ class SIP:
         :param metadata: The iterable of metadata objects that is added.
         """
         div = self.default_structural_map.root_div
-        for metadata_element in metadata:
-            # TODO: This code expects that all ImportedMetadata is
-            # descriptive metadata. So if some other type of metadata is
-            # imported, the PREMIS event will contain wrong
-            # information.
-            if isinstance(metadata_element, ImportedMetadata):
-                div.add_metadata([_create_metadata_import_event()])
+        metadata = list(metadata)
+        # TODO: This code expects that all ImportedMetadata is
+        # descriptive metadata. So if some other type of metadata is
+        # imported, the PREMIS event will contain wrong
+        # information.
+        if any(isinstance(metadata_element, ImportedMetadata)
+               for metadata_element in metadata):
+            div.add_metadata([_create_metadata_import_event()])
         div.add_metadata(metadata)
 
 
+def _add_to_tar(
+    tarred_sip: tarfile.TarFile,
+    path: Path,
+    arcname: str
+) -> None:
+    """Add a file to a tar file, reading it through a large buffer.
+
+    Works like :meth:`tarfile.TarFile.add` for a single file, but reads
+    the file in :data:`TAR_BUFFER_SIZE` chunks also on Python versions
+    where :attr:`tarfile.TarFile.copybufsize` is not supported.
+
+    :param tarred_sip: Tar file open for writing.
+    :param path: Path to the file to add.
+    :param arcname: Path of the file in the tar file.
+    """
+    tarinfo = tarred_sip.gettarinfo(name=path, arcname=arcname)
+    if tarinfo.isreg():
+        with open(path, "rb", buffering=TAR_BUFFER_SIZE) as file_:
+            _fadvise(file_.fileno(), "POSIX_FADV_SEQUENTIAL")
+            tarred_sip.addfile(tarinfo, file_)
+            # The file is not read again, so do not let it crowd out other
+            # data from the page cache
+            _fadvise(file_.fileno(), "POSIX_FADV_DONTNEED")
+    else:
+        # Hard link to a file already in the tar file
+        tarred_sip.addfile(tarinfo)
+
+
+def _prefetch_file(filepath: Path) -> None:
+    """Ask the operating system to start reading a file into page cache.
+
+    Only the first :data:`PREFETCH_SIZE` bytes are requested, so that
+    prefetching large files does not evict files that are being written.
+    Errors are ignored, as the prefetch is only a hint.
+
+    :param filepath: Path to the file to prefetch.
+    """
+    try:
+        fd = os.open(filepath, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        _fadvise(fd, "POSIX_FADV_WILLNEED", length=PREFETCH_SIZE)
+    finally:
+        os.close(fd)
+
+
+def _prefetch_files(files: List[File]) -> Iterator[File]:
+    """Iterate over files while prefetching the upcoming files.
+
+    While the caller processes a file, the next :data:`PREFETCH_FILE_COUNT`
+    files are prefetched in a background thread, so that reading them from
+    the disk overlaps with the processing of the current file.
+
+    :param files: Files to iterate over.
+
+    :returns: Iterator of the given files in the same order.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        # Prefetching is not supported on this platform
+        yield from files
+        return
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        for file in files[:PREFETCH_FILE_COUNT]:
+            executor.submit(_prefetch_file, file.path)
+        for index, file in enumerate(files):
+            upcoming_index = index + PREFETCH_FILE_COUNT
+            if upcoming_index < len(files):
+                executor.submit(_prefetch_file, files[upcoming_index].path)
+            yield file
+
+
+def _scan_files(directory_path: Path) -> Iterator[os.DirEntry]:
+    """Iterate over all files in a directory tree.
+
+    The directory tree is walked iteratively with :func:`os.scandir`, so
+    that the file type of each entry is read from the directory listing
+    instead of stat'ing every entry separately. Symbolic links to files are
+    included, but symbolic links to directories are not followed.
+
+    :param directory_path: Path to the root of the directory tree.
+
+    :returns: Iterator of directory entries representing the files.
+    """
+    stack = [os.fspath(directory_path)]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+
+
 def _structural_map_from_directory_structure(
     files: Iterable[File],
 ) -> StructuralMap:
@@ -322,38 +497,44 @@ def _structural_map_from_directory_structure(
     structural_map = StructuralMap(StructuralMapDiv(div_type="directory"),
                                    structural_map_type='PHYSICAL')
 
-    # dict directory filepath -> corresponding div
-    # In the algorithm below, PurePath(".") can be thought of as the root
-    # div that has already been created, initialize the dict with that
-    path2div = {PurePath("."): structural_map.root_div}
+    # dict directory path parts -> corresponding div
+    # The directories are keyed by tuples of their path components, which
+    # are cheaper to slice and hash than path objects. In the algorithm
+    # below, the empty tuple can be thought of as the root div that has
+    # already been created, initialize the dict with that
+    path2div: Dict[Tuple[str, ...], StructuralMapDiv] = {
+        (): structural_map.root_div
+    }
 
-    # dict directory filepath -> child directory filepaths
-    directory_relationships = defaultdict(set)
+    # The metadata import event is identical for all files, so it is
+    # created only once when it is needed
+    metadata_import_event = None
 
     for file in files:
 
         digital_object = file.digital_object
-        digital_object_path = PurePath(digital_object.path)
-
-        for path in digital_object_path.parents:
-            # Do not process path "."
-            if path == PurePath("."):
-                continue
-
-            # Create corresponding div for directories if they do not exist yet
-            if path not in path2div:
-                path2div[path] = StructuralMapDiv(
+        parts = PurePath(digital_object.path).parts
+        directory = parts[:-1]
+
+        # Create corresponding divs for directories if they do not exist
+        # yet. The directories are processed starting from the root, so
+        # that each new div can be added to its parent div right away.
+        if directory not in path2div:
+            for depth in range(1, len(parts)):
+                path = parts[:depth]
+                if path in path2div:
+                    continue
+                directory_div = StructuralMapDiv(
                     div_type="directory",
-                    label=path.name
+                    label=path[-1]
                 )
-
-            # Save directory relationships to be dealt with later
-            directory_relationships[path.parent].add(path)
+                path2div[path[:-1]].add_divs({directory_div})
+                path2div[path] = directory_div
 
         # Create a wrapper div for the digital object and add it to parent div
         wrapper_div = StructuralMapDiv(
             div_type="file",
-            label=Path(digital_object.path).name
+            label=parts[-1]
         )
         wrapper_div.add_digital_objects([digital_object])
         wrapper_div.add_metadata(file.descriptive_metadata)
@@ -361,17 +542,13 @@ def _structural_map_from_directory_structure(
         # TODO: This code expects that imported metadata is always
         # descriptive. So if user imports some other medatata to file,
         # PREMIS event is not created. Is it correct?
-        for metadata_element in file.descriptive_metadata:
-            if isinstance(metadata_element, ImportedMetadata):
-                wrapper_div.add_metadata([_create_metadata_import_event()])
-
-        path2div[digital_object_path.parent].divs.add(wrapper_div)
+        if any(isinstance(metadata_element, ImportedMetadata)
+               for metadata_element in file.descriptive_metadata):
+            if metadata_import_event is None:
+                metadata_import_event = _create_metadata_import_event()
+            wrapper_div.add_metadata([metadata_import_event])
 
-    # Nest divs according to the directory structure
-    for parent_dir, child_dirs in directory_relationships.items():
-        parent_div = path2div[parent_dir]
-        child_divs = {path2div[directory] for directory in child_dirs}
-        parent_div.add_divs(child_divs)
+        path2div[directory].divs.add(wrapper_div)
 
     # Document the process as digital provenance metadata
     event = DigitalProvenanceEventMetadata(
@@ -22,3 +22,11 @@ def test_get_file_scraper_agent():
     assert agent.version == file_scraper.__version__
     assert agent.agent_identifier_type == "UUID"
     assert agent.agent_identifier is None
+
+
+def test_agents_are_shared():
+    """Test that the same agent instances are returned on every call."""
+    assert siptools_ng.agent.get_siptools_ng_agent() \
+        is siptools_ng.agent.get_siptools_ng_agent()
+    assert siptools_ng.agent.get_file_scraper_agent() \
+        is siptools_ng.agent.get_file_scraper_agent()
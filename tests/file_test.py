@@ -1,5 +1,9 @@
 """Test File."""
+import concurrent.futures
+import errno
+import hashlib
 import itertools
+import weakref
 from datetime import datetime
 
 import file_scraper
@@ -13,7 +17,8 @@ from mets_builder.metadata import (DigitalProvenanceAgentMetadata,
                                    TechnicalImageMetadata,
                                    TechnicalVideoMetadata)
 
-from siptools_ng.file import File, MetadataGenerationError
+from siptools_ng.file import (File, MetadataGenerationError,
+                              _create_scraper_agents, _file_checksum)
 from utils import find_metadata
 
 
@@ -36,6 +41,29 @@ def test_digital_object_path_validity(path):
     assert "is not a file." in str(error.value)
 
 
+def test_digital_object_path_stat_error(monkeypatch):
+    """Test that errors other than a missing source file are not hidden."""
+    def _stat(path):
+        raise PermissionError(errno.EACCES, "Permission denied", path)
+
+    monkeypatch.setattr("os.stat", _stat)
+
+    with pytest.raises(PermissionError):
+        File(
+            path="tests/data/test_file.txt",
+            digital_object_path="sip_data/test_file.txt"
+        )
+
+
+def test_file_weak_reference():
+    """Test that File instances can be weakly referenced."""
+    file = File(
+        path="tests/data/test_file.txt",
+        digital_object_path="sip_data/test_file.txt"
+    )
+    assert weakref.ref(file)() is file
+
+
 def test_resolve_symbolic_link_as_path():
     """Test that if symbolic link is given as source filepath, it is resolved
     to the orginal file.
@@ -602,6 +630,48 @@ def test_event(event_type, detail, outcome_detail,
     }
 
 
+def test_checksum_event_is_shared():
+    """Test that the identical checksum calculation event is shared by the
+    files instead of creating a new event for every file.
+    """
+    files = [
+        File(path=path, digital_object_path=f"sip_data/{index}")
+        for index, path in enumerate(
+            ["tests/data/test_file.txt", "tests/data/test_csv.csv"]
+        )
+    ]
+    checksum_events = []
+    for file in files:
+        file.generate_technical_metadata()
+        checksum_events.append(next(
+            metadata for metadata in file.digital_object.metadata
+            if isinstance(metadata, DigitalProvenanceEventMetadata)
+            and metadata.event_type == "message digest calculation"
+        ))
+
+    assert checksum_events[0] is checksum_events[1]
+
+
+def test_scraper_agents_are_shared():
+    """Test that agents are shared by scrapers with the same class and
+    tools.
+    """
+    scraper_infos = [
+        {"class": "TestScraper", "tools": ["tool-1.0", "other-tool-2.0"]},
+        {"class": "TestDetector", "tools": []}
+    ]
+    agents = _create_scraper_agents(scraper_infos)
+    assert agents[0].name == "TestScraper"
+    assert agents[0].note == \
+        "Used tools (name-version): tool-1.0, other-tool-2.0"
+    assert agents[1].name == "TestDetector"
+    assert agents[1].note is None
+
+    for agent, shared_agent in zip(agents,
+                                   _create_scraper_agents(scraper_infos)):
+        assert agent is shared_agent
+
+
 @pytest.mark.parametrize(
     "kwargs,expected_event_types",
     [
@@ -674,6 +744,94 @@ def test_previously_scraped_data():
     assert technical_metadata.checksum == "test_checksum"
 
 
+def test_generate_technical_metadata_batch():
+    """Test generating technical metadata for multiple files in parallel.
+
+    The files share the same source file, which is scraped only once, but
+    all files should get their own technical metadata.
+    """
+    files = [
+        File(path="tests/data/test_file.txt",
+             digital_object_path=f"data/file{index}.txt")
+        for index in range(3)
+    ]
+    File.generate_technical_metadata_batch(files, max_workers=2)
+
+    for file in files:
+        technical_metadata = find_metadata(file, TechnicalFileObjectMetadata)
+        assert technical_metadata.checksum \
+            == "d8e8fca2dc0f896fd7cb4cb0031ba249"
+
+    # Generating the metadata again should fail
+    with pytest.raises(MetadataGenerationError):
+        File.generate_technical_metadata_batch(files)
+
+
+def test_generate_technical_metadata_batch_worker_count(monkeypatch):
+    """Test that no more worker processes are started than there are
+    source files to scrape.
+    """
+    worker_counts = []
+
+    def _executor(max_workers):
+        worker_counts.append(max_workers)
+        return concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+
+    monkeypatch.setattr("concurrent.futures.ProcessPoolExecutor", _executor)
+
+    files = [
+        File(path=path, digital_object_path=f"data/file{index}")
+        for index, path in enumerate(["tests/data/test_file.txt",
+                                      "tests/data/test_csv.csv"])
+    ]
+    File.generate_technical_metadata_batch(files, max_workers=8)
+
+    assert worker_counts == [2]
+    assert all(file._technical_metadata_generated for file in files)
+
+
+def test_generate_technical_metadata_batch_checksum_algorithm():
+    """Test generating technical metadata in parallel with a non-default
+    checksum algorithm.
+    """
+    file = File(path="tests/data/test_file.txt",
+                digital_object_path="data/file.txt")
+    File.generate_technical_metadata_batch(
+        [file], max_workers=1, checksum_algorithm="SHA-256"
+    )
+
+    technical_metadata = find_metadata(file, TechnicalFileObjectMetadata)
+    assert technical_metadata.checksum_algorithm.value == "SHA-256"
+    assert technical_metadata.checksum == (
+        "f2ca1bb6c7e907d06dafe4687e579fce76b37e4e93b7605022da52e6ccc26fd2"
+    )
+
+
+def test_generate_technical_metadata_batch_invalid_checksum_algorithm():
+    """Test that unsupported checksum algorithms are rejected."""
+    file = File(path="tests/data/test_file.txt",
+                digital_object_path="data/file.txt")
+    with pytest.raises(ValueError) as error:
+        File.generate_technical_metadata_batch(
+            [file], checksum_algorithm="TIGER"
+        )
+    assert str(error.value) == "Unsupported checksum algorithm 'TIGER'."
+
+
+@pytest.mark.parametrize("max_workers", [0, -1])
+def test_generate_technical_metadata_batch_invalid_max_workers(max_workers):
+    """Test that worker counts less than one are rejected."""
+    file = File(path="tests/data/test_file.txt",
+                digital_object_path="data/file.txt")
+    with pytest.raises(ValueError) as error:
+        File.generate_technical_metadata_batch(
+            [file], max_workers=max_workers
+        )
+    assert str(error.value) == (
+        f"Invalid number of worker processes '{max_workers}'."
+    )
+
+
 def test_add_metadata():
     """Test adding metadata to file.
 
@@ -721,3 +879,52 @@ def test_add_descriptive_metadata():
 
     # The metadata should also be accessible via "metadata" property
     assert descriptive_md in file.metadata
+
+
+def test_add_metadata_from_generator():
+    """Test adding both descriptive and other metadata from a generator.
+
+    The metadata should be sorted correctly even though the iterable can
+    be consumed only once.
+    """
+    file = File(path="tests/data/test_file.txt", digital_object_path='foo')
+
+    descriptive_md = ImportedMetadata(
+        metadata_type="descriptive",
+        metadata_format="OTHER",
+        other_format="foo",
+        format_version="bar",
+        data_string="adsf",
+    )
+    event = DigitalProvenanceEventMetadata(
+        event_type="creation",
+        detail="test event",
+        outcome="success",
+        outcome_detail="test detail",
+    )
+    file.add_metadata(md for md in [descriptive_md, event])
+
+    assert file.descriptive_metadata == {descriptive_md}
+    assert file.digital_object.metadata == {event}
+
+
+@pytest.mark.parametrize("algorithm", ["md5", "sha256"])
+def test_file_checksum(algorithm):
+    """Test that file checksum matches the checksum calculated by hashlib."""
+    path = "tests/data/test_audio.wav"
+    with open(path, "rb") as file_:
+        expected = hashlib.new(algorithm, file_.read()).hexdigest()
+
+    assert _file_checksum(path, algorithm) == expected
+
+
+def test_file_has_no_instance_dict():
+    """Test that File instances do not have a __dict__.
+
+    Attributes are stored in slots to keep the memory footprint of large
+    SIPs small.
+    """
+    file = File(path="tests/data/test_file.txt", digital_object_path="foo")
+    assert not hasattr(file, "__dict__")
+    with pytest.raises(AttributeError):
+        file.unknown_attribute = "foo"
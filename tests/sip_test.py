@@ -1,5 +1,6 @@
 """Test SIPs."""
 import hashlib
+import os
 import tarfile
 from pathlib import Path
 
@@ -12,13 +13,15 @@ from mets_builder.metadata import (DigitalProvenanceAgentMetadata,
                                    ImportedMetadata,
                                    Metadata,
                                    MetadataFormat,
-                                   MetadataType)
+                                   MetadataType,
+                                   TechnicalFileObjectMetadata)
 from mets_builder.structural_map import StructuralMapDiv
 from utils import find_metadata
 
 import siptools_ng.agent
 from siptools_ng.file import File
-from siptools_ng.sip import SIP, _structural_map_from_directory_structure
+from siptools_ng.sip import (SIP, _add_to_tar, _prefetch_files,
+                             _structural_map_from_directory_structure)
 
 
 def _extract_sip(digital_object_path, extract_filepath):
@@ -69,6 +72,14 @@ def test_default_structural_map(simple_mets, files):
     assert len(sip.mets.structural_maps) == 1
 
 
+def test_default_structural_map_not_generated(simple_mets):
+    """Test that SIP without generated structural map has no default
+    structural map.
+    """
+    sip = SIP(mets=simple_mets)
+    assert sip.default_structural_map is None
+
+
 def test_simple_sip(simple_sip):
     """Test that simple sip has the default structural map."""
     assert len(simple_sip.mets.structural_maps) == 2
@@ -138,6 +149,79 @@ def test_sip_is_tar_file(tmp_path, simple_sip):
     assert tarfile.is_tarfile(output_filepath)
 
 
+def test_metadata_files_first_in_sip(tmp_path, simple_sip):
+    """Test that the METS file and the signature file are the first members
+    of the finalized SIP.
+    """
+    output_filepath, _ = _get_testing_filepaths(tmp_path)
+
+    simple_sip.finalize(
+        output_filepath=output_filepath,
+        sign_key_filepath="tests/data/rsa-keys.crt"
+    )
+
+    with tarfile.open(output_filepath) as sip:
+        assert sip.getnames()[:2] == ["mets.xml", "signature.sig"]
+
+
+def test_finalize_with_missing_source_file(tmp_path, simple_mets):
+    """Test that no partial SIP is left behind if packing the digital
+    objects fails.
+    """
+    source_path = tmp_path / "source"
+    source_path.mkdir()
+    (source_path / "large_file.txt").write_text("foo" * 1000)
+    (source_path / "small_file.txt").write_text("foo")
+    files = [
+        File(path=source_path / name, digital_object_path=f"data/{name}")
+        for name in ["large_file.txt", "small_file.txt"]
+    ]
+    sip = SIP.from_files(mets=simple_mets, files=files)
+
+    # The small file is packed after the large one, so packing fails
+    # partway through the tar
+    (source_path / "small_file.txt").unlink()
+
+    output_path = tmp_path / "output"
+    output_path.mkdir()
+    with pytest.raises(FileNotFoundError):
+        sip.finalize(
+            output_filepath=output_path / "sip.tar",
+            sign_key_filepath="tests/data/rsa-keys.crt"
+        )
+    assert list(output_path.iterdir()) == []
+
+
+def test_prefetch_files(files):
+    """Test that prefetching files preserves the order of the files."""
+    files = list(files) * 3
+    assert list(_prefetch_files(files)) == files
+
+
+def test_add_to_tar(tmp_path):
+    """Test adding files to a tar file.
+
+    The file contents should be written to the tar file, and a second
+    hard link to the same file should be stored as a link to the first
+    one.
+    """
+    source = tmp_path / "source.txt"
+    source.write_text("foo")
+    link = tmp_path / "link.txt"
+    os.link(str(source), str(link))
+
+    tar_filepath = tmp_path / "test.tar"
+    with tarfile.open(tar_filepath, "w") as tarred_sip:
+        _add_to_tar(tarred_sip, path=source, arcname="data/source.txt")
+        _add_to_tar(tarred_sip, path=link, arcname="data/link.txt")
+
+    with tarfile.open(tar_filepath) as tarred_sip:
+        assert tarred_sip.extractfile("data/source.txt").read() == b"foo"
+        link_member = tarred_sip.getmember("data/link.txt")
+        assert link_member.islnk()
+        assert link_member.linkname == "data/source.txt"
+
+
 @pytest.mark.parametrize(
     ("filepath", "error_message"),
     (
@@ -188,6 +272,66 @@ def test_generated_sip_digital_provenance(simple_mets):
     assert siptools_ng_agent in linked_agents
 
 
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_generated_sip_technical_metadata(simple_mets, max_workers):
+    """Test that technical metadata is generated for every file found in the
+    directory, regardless of the number of worker processes.
+    """
+    sip = SIP.from_directory(
+        directory_path="tests/data/generate_sip_from_directory/data",
+        mets=simple_mets,
+        max_workers=max_workers
+    )
+
+    assert len(sip.files) == 3
+    for file in sip.files:
+        assert file._technical_metadata_generated
+        technical_metadata = find_metadata(file, TechnicalFileObjectMetadata)
+        assert technical_metadata.original_name == file.path.name
+
+
+def test_generate_sip_from_duplicate_files(simple_mets):
+    """Test that a File given more than once is only scraped once."""
+    file = File(path="tests/data/test_file.txt",
+                digital_object_path="data/test_file.txt")
+
+    SIP.from_files(mets=simple_mets, files=[file, file])
+
+    assert file._technical_metadata_generated
+
+
+def test_generated_sip_checksum_algorithm(simple_mets):
+    """Test generating a SIP with a non-default checksum algorithm."""
+    sip = SIP.from_directory(
+        directory_path="tests/data/generate_sip_from_directory/data",
+        mets=simple_mets,
+        checksum_algorithm="SHA-256"
+    )
+
+    for file in sip.files:
+        technical_metadata = find_metadata(file, TechnicalFileObjectMetadata)
+        assert technical_metadata.checksum_algorithm.value == "SHA-256"
+        assert technical_metadata.checksum == hashlib.sha256(
+            file.path.read_bytes()
+        ).hexdigest()
+
+
+def test_generated_sip_scraped_in_process_by_default(simple_mets,
+                                                     monkeypatch):
+    """Test that no worker processes are started unless requested."""
+    def _fail(*args, **kwargs):
+        raise AssertionError("Worker processes were started")
+
+    monkeypatch.setattr("concurrent.futures.ProcessPoolExecutor", _fail)
+
+    sip = SIP.from_directory(
+        directory_path="tests/data/generate_sip_from_directory/data",
+        mets=simple_mets
+    )
+
+    assert all(file._technical_metadata_generated for file in sip.files)
+
+
 def test_generating_structural_map_from_directory():
     """Test generating structural map from directory contents.
 